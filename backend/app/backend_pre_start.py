@@ -1,40 +1,52 @@
-import logfire
 import logging
 
-from sqlalchemy import Engine
-from sqlmodel import Session, select
-from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
+import logfire
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+from tenacity import (
+    after_log,
+    before_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_delay,
+    wait_random_exponential,
+)
 
 from app.core.db import engine
 from app.core.logfire_config import configure_logfire
 
-# Configure logfire
-configure_logfire()
+logger = logging.getLogger(__name__)
 
-max_tries = 60 * 5  # 5 minutes
-wait_seconds = 1
+max_delay_seconds = 60 * 5  # 5 minutes
+max_wait_seconds = 30
 
-logger = logging.getLogger("logfire")
 
 @retry(
-    stop=stop_after_attempt(max_tries),
-    wait=wait_fixed(wait_seconds),
-    before=before_log(logfire, "INFO"),
-    after=after_log(logfire, "WARNING"),
+    stop=stop_after_delay(max_delay_seconds),
+    # Exponential backoff with jitter so restarting replicas don't poll the DB in lockstep
+    wait=wait_random_exponential(multiplier=0.5, max=max_wait_seconds),
+    # Only connection failures are worth retrying, anything else is a bug
+    retry=retry_if_exception_type(OperationalError),
+    before=before_log(logger, logging.INFO),
+    after=after_log(logger, logging.WARNING),
 )
 def init(db_engine: Engine) -> None:
     try:
-        with Session(db_engine) as session:
-            # Try to create session to check if DB is awake
-            session.exec(select(1))
-    except Exception as e:
-        logfire.error(e)
+        # Try to open a connection to check if DB is awake, no ORM session needed
+        with db_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except OperationalError as e:
+        logger.error(e)
         raise e
 
 
 def main() -> None:
-    logfire.info("Initializing service")
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Initializing service")
     init(engine)
+
+    # Only set up logfire exporters once the DB is reachable
+    configure_logfire()
     logfire.info("Service finished initializing")
 
 
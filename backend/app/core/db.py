@@ -1,4 +1,3 @@
-import logfire
 from sqlmodel import Session, create_engine, select
 
 from app import crud
@@ -1,52 +1,175 @@
-import logfire
+import configparser
+import functools
 import logging
-import subprocess
 import os
+import subprocess
+import threading
 from pathlib import Path
 
+import logfire
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+# Don't let a hung git (slow NFS, broken .git) hold up startup
+_GIT_TIMEOUT_SECONDS = 1.0
+
+_CONFIGURED = False
+_CONFIGURE_LOCK = threading.Lock()
+
+
+def _read_build_file(name: str) -> str | None:
+    """Read a value baked into the image at build time (see backend/Dockerfile)."""
+    try:
+        return (_BACKEND_ROOT / name).read_text().strip() or None
+    except OSError:
+        return None
+
+
+def _find_git_dir() -> Path | None:
+    """Find the .git directory for the checkout this module lives in."""
+    for directory in (_BACKEND_ROOT, *_BACKEND_ROOT.parents):
+        git_dir = directory / ".git"
+        if git_dir.is_dir():
+            return git_dir
+        if git_dir.exists():
+            # A .git file (worktree, submodule) points elsewhere, leave those to git itself
+            return None
+    return None
+
+
+def _read_git_revision(git_dir: Path) -> str | None:
+    """Resolve HEAD to a commit hash by reading .git/HEAD and the refs it points to."""
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            # Detached HEAD already holds the commit hash
+            return head
+
+        ref = head[len("ref: ") :]
+        ref_file = git_dir / ref
+        if ref_file.is_file():
+            return ref_file.read_text().strip()
+
+        packed_refs = git_dir / "packed-refs"
+        if packed_refs.is_file():
+            for line in packed_refs.read_text().splitlines():
+                sha, _, name = line.partition(" ")
+                if name == ref:
+                    return sha
+    except (OSError, UnicodeDecodeError):
+        pass
+    return None
+
 
+def _read_git_repository(git_dir: Path) -> str | None:
+    """Read the origin remote URL from .git/config.
+
+    Handles inline `#`/`;` comments and quoted values, but it is not a full git
+    config parser. Unlike `git remote get-url`:
+    - no `url.<base>.insteadOf` rewrites are applied
+    - if origin has several `url` entries the last one wins, git uses the first
+    """
+    try:
+        # git treats config as bytes, don't fail on e.g. a Latin-1 user.name
+        config_text = (git_dir / "config").read_text(
+            encoding="utf-8", errors="surrogateescape"
+        )
+    except OSError:
+        return None
+
+    config = configparser.ConfigParser(
+        strict=False,
+        allow_no_value=True,
+        interpolation=None,
+        inline_comment_prefixes=("#", ";"),
+    )
+    try:
+        config.read_string(config_text)
+    except configparser.Error:
+        return None
+
+    url = config.get('remote "origin"', "url", fallback=None)
+    if url and len(url) >= 2 and url[0] == url[-1] == '"':
+        url = url[1:-1]
+    return url
+
+
+@functools.lru_cache(maxsize=1)
 def get_git_revision() -> str:
     """Get the current git commit hash."""
-    if os.environ.get("GIT_COMMIT") is not None:
-        return os.environ["GIT_COMMIT"]
+    # docker-compose always sets the variable, empty when the host doesn't export it
+    if revision := os.environ.get("GIT_COMMIT"):
+        return revision
 
+    if (revision := _read_build_file("GIT_COMMIT")) is not None:
+        return revision
+
+    git_dir = _find_git_dir()
+    if git_dir is not None and (revision := _read_git_revision(git_dir)):
+        return revision
+
+    # Fall back to git itself for layouts we don't parse (worktrees, submodules, ...)
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
             capture_output=True,
             text=True,
-            cwd=Path(__file__).parent.parent.parent
+            cwd=_BACKEND_ROOT,
+            timeout=_GIT_TIMEOUT_SECONDS,
         )
         return result.stdout.strip()
     except (subprocess.SubprocessError, FileNotFoundError):
         return "unknown"
 
 
+@functools.lru_cache(maxsize=1)
 def get_git_repository() -> str:
     """Get the git repository URL."""
-    if os.environ.get("GIT_REPO_URL") is not None:
-        return os.environ["GIT_REPO_URL"]
+    # docker-compose always sets the variable, empty when the host doesn't export it
+    if repository := os.environ.get("GIT_REPO_URL"):
+        return repository
+
+    if (repository := _read_build_file("GIT_REPO_URL")) is not None:
+        return repository
+
+    git_dir = _find_git_dir()
+    if git_dir is not None and (repository := _read_git_repository(git_dir)):
+        return repository
 
+    # Fall back to git itself for layouts we don't parse (worktrees, submodules, ...)
     try:
         result = subprocess.run(
             ["git", "remote", "get-url", "origin"],
             capture_output=True,
             text=True,
-            cwd=Path(__file__).parent.parent.parent
+            cwd=_BACKEND_ROOT,
+            timeout=_GIT_TIMEOUT_SECONDS,
         )
         return result.stdout.strip()
     except (subprocess.SubprocessError, FileNotFoundError):
         return "https://github.com/Recurse-ML/logfire-example"
 
 
-def configure_logfire():
-    """Configure logfire with CodeSource information."""
-    logger = logging.getLogger("logfire_config")
-    logger.warning(f"Configuring logfire with Code source {get_git_repository()} at revision {get_git_revision()}")
-    logfire.configure(
-        code_source=logfire.CodeSource(
-            repository=get_git_repository(),
-            revision=get_git_revision(),
-            root_path="",
+def configure_logfire() -> None:
+    """Configure logfire with CodeSource information.
+
+    Safe to call from every entrypoint, only the first call configures logfire.
+    """
+    global _CONFIGURED
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED:
+            return
+
+        repository = get_git_repository()
+        revision = get_git_revision()
+        logger = logging.getLogger("logfire_config")
+        logger.warning(
+            f"Configuring logfire with Code source {repository} at revision {revision}"
         )
-    )
+        logfire.configure(
+            code_source=logfire.CodeSource(
+                repository=repository,
+                revision=revision,
+                root_path="",
+            )
+        )
+        _CONFIGURED = True
@@ -1,13 +1,9 @@
 import logfire
-
 from sqlmodel import Session
 
 from app.core.db import engine, init_db
 from app.core.logfire_config import configure_logfire
 
-# Configure logfire
-configure_logfire()
-
 
 def init() -> None:
     with Session(engine) as session:
@@ -15,6 +11,7 @@ def init() -> None:
 
 
 def main() -> None:
+    configure_logfire()
     logfire.info("Creating initial data")
     init()
     logfire.info("Initial data created")
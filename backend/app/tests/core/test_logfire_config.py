@@ -0,0 +1,251 @@
+import subprocess
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.core import logfire_config
+
+
+@pytest.fixture(autouse=True)
+def clear_git_caches() -> Generator[None, None, None]:
+    logfire_config.get_git_revision.cache_clear()
+    logfire_config.get_git_repository.cache_clear()
+    yield
+    logfire_config.get_git_revision.cache_clear()
+    logfire_config.get_git_repository.cache_clear()
+
+
+@pytest.fixture()
+def no_git_overrides(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    # No env vars, no baked files and no .git, so only the git subprocess is left
+    monkeypatch.delenv("GIT_COMMIT", raising=False)
+    monkeypatch.delenv("GIT_REPO_URL", raising=False)
+    monkeypatch.setattr(logfire_config, "_BACKEND_ROOT", tmp_path)
+    return tmp_path
+
+
+def test_configure_logfire_is_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logfire_config, "_CONFIGURED", False)
+
+    with patch("logfire.configure") as configure_mock:
+        logfire_config.configure_logfire()
+        logfire_config.configure_logfire()
+
+    assert (
+        configure_mock.call_count == 1
+    ), "logfire should only be configured on the first call."
+
+
+@pytest.mark.usefixtures("no_git_overrides")
+def test_git_lookups_survive_subprocess_timeout() -> None:
+    with patch(
+        "subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="git", timeout=1.0)
+    ):
+        assert logfire_config.get_git_revision() == "unknown"
+        assert (
+            logfire_config.get_git_repository()
+            == "https://github.com/Recurse-ML/logfire-example"
+        )
+
+
+def _make_git_dir(root: Path, head: str) -> Path:
+    git_dir = root / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text(head)
+    return git_dir
+
+
+def test_read_git_revision_detached_head(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "1111111111111111111111111111111111111111\n")
+
+    assert (
+        logfire_config._read_git_revision(git_dir)
+        == "1111111111111111111111111111111111111111"
+    )
+
+
+def test_read_git_revision_loose_ref(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "refs" / "heads" / "master").write_text(
+        "2222222222222222222222222222222222222222\n"
+    )
+
+    assert (
+        logfire_config._read_git_revision(git_dir)
+        == "2222222222222222222222222222222222222222"
+    )
+
+
+def test_read_git_revision_packed_ref(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted \n"
+        "3333333333333333333333333333333333333333 refs/heads/feature\n"
+        "4444444444444444444444444444444444444444 refs/tags/v1.0\n"
+        "^5555555555555555555555555555555555555555\n"
+        "6666666666666666666666666666666666666666 refs/heads/master\n"
+    )
+
+    assert (
+        logfire_config._read_git_revision(git_dir)
+        == "6666666666666666666666666666666666666666"
+    )
+
+
+def test_read_git_revision_unresolvable_ref(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+
+    assert logfire_config._read_git_revision(git_dir) is None
+
+
+def test_read_git_repository(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "config").write_text(
+        "[core]\n"
+        "\trepositoryformatversion = 0\n"
+        "\tbare = false\n"
+        '[remote "upstream"]\n'
+        "\turl = https://github.com/other/repo.git\n"
+        '[remote "origin"]\n'
+        "\turl = git@github.com:org/repo.git\n"
+        "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
+        "\tfetch = +refs/tags/*:refs/tags/*\n"
+    )
+
+    assert logfire_config._read_git_repository(git_dir) == "git@github.com:org/repo.git"
+
+
+@pytest.mark.parametrize(
+    "url_lines, expected",
+    [
+        ("\turl = https://x/y.git ; old\n", "https://x/y.git"),
+        ("\turl = https://x/y.git # old\n", "https://x/y.git"),
+        ('\turl = "https://x/y.git"\n', "https://x/y.git"),
+        # Documented limitation, git itself would return the first url
+        (
+            "\turl = https://x/first.git\n\turl = https://x/last.git\n",
+            "https://x/last.git",
+        ),
+    ],
+)
+def test_read_git_repository_url_syntax(
+    tmp_path: Path, url_lines: str, expected: str
+) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "config").write_text('[remote "origin"]\n' + url_lines)
+
+    assert logfire_config._read_git_repository(git_dir) == expected
+
+
+def test_read_git_repository_without_origin(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "config").write_text("[core]\n\tbare = false\n")
+
+    assert logfire_config._read_git_repository(git_dir) is None
+
+
+def test_read_git_repository_non_utf8_config(tmp_path: Path) -> None:
+    git_dir = _make_git_dir(tmp_path, "ref: refs/heads/master\n")
+    (git_dir / "config").write_bytes(
+        "[user]\n"
+        "\tname = José\n"
+        '[remote "origin"]\n'
+        "\turl = https://github.com/org/repo.git\n".encode("latin-1")
+    )
+
+    assert (
+        logfire_config._read_git_repository(git_dir)
+        == "https://github.com/org/repo.git"
+    )
+
+
+def test_get_git_revision_finds_git_dir_above_backend(
+    no_git_overrides: Path,
+) -> None:
+    backend_root = no_git_overrides / "backend"
+    backend_root.mkdir()
+    _make_git_dir(no_git_overrides, "7777777777777777777777777777777777777777\n")
+
+    with (
+        patch.object(logfire_config, "_BACKEND_ROOT", backend_root),
+        patch("subprocess.run") as run_mock,
+    ):
+        assert (
+            logfire_config.get_git_revision()
+            == "7777777777777777777777777777777777777777"
+        )
+
+    assert not run_mock.called, "git should not be spawned when .git can be read."
+
+
+def test_git_file_falls_back_to_subprocess(no_git_overrides: Path) -> None:
+    (no_git_overrides / ".git").write_text("gitdir: /elsewhere/.git/worktrees/app\n")
+
+    assert logfire_config._find_git_dir() is None
+
+    with patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(
+            args=["git", "rev-parse", "HEAD"],
+            returncode=0,
+            stdout="8888888888888888888888888888888888888888\n",
+        ),
+    ) as run_mock:
+        assert (
+            logfire_config.get_git_revision()
+            == "8888888888888888888888888888888888888888"
+        )
+
+    assert run_mock.call_count == 1
+
+
+def test_empty_env_var_falls_through_to_baked_file(
+    no_git_overrides: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # docker-compose passes GIT_COMMIT= / GIT_REPO_URL= when the host doesn't export them
+    monkeypatch.setenv("GIT_COMMIT", "")
+    monkeypatch.setenv("GIT_REPO_URL", "")
+    (no_git_overrides / "GIT_COMMIT").write_text("abc123\n")
+    (no_git_overrides / "GIT_REPO_URL").write_text("https://github.com/org/repo.git\n")
+
+    assert logfire_config.get_git_revision() == "abc123"
+    assert logfire_config.get_git_repository() == "https://github.com/org/repo.git"
+
+
+def test_env_var_takes_priority_over_baked_file(
+    no_git_overrides: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GIT_COMMIT", "from-env")
+    (no_git_overrides / "GIT_COMMIT").write_text("from-file\n")
+
+    assert logfire_config.get_git_revision() == "from-env"
+
+
+@pytest.mark.parametrize("content", ["", "  \n"])
+def test_empty_baked_file_falls_through_to_git_dir(
+    no_git_overrides: Path, content: str
+) -> None:
+    (no_git_overrides / "GIT_COMMIT").write_text(content)
+    _make_git_dir(no_git_overrides, "9999999999999999999999999999999999999999\n")
+
+    assert (
+        logfire_config.get_git_revision() == "9999999999999999999999999999999999999999"
+    )
+
+
+@pytest.mark.usefixtures("no_git_overrides")
+def test_git_lookups_are_memoized() -> None:
+    with patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="x\n"),
+    ) as run_mock:
+        for _ in range(2):
+            logfire_config.get_git_revision()
+            logfire_config.get_git_repository()
+
+    assert [call.args[0][:2] for call in run_mock.call_args_list] == [
+        ["git", "rev-parse"],
+        ["git", "remote"],
+    ], "git should be spawned at most once per getter."
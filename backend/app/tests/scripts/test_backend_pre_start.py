@@ -1,23 +1,17 @@
 from unittest.mock import MagicMock, patch
 
-from sqlmodel import select
+import pytest
+from sqlalchemy.exc import OperationalError
+from tenacity import wait_none
 
 from app.backend_pre_start import init
 
 
 def test_init_successful_connection() -> None:
     engine_mock = MagicMock()
+    connection_mock = engine_mock.connect.return_value.__enter__.return_value
 
-    session_mock = MagicMock()
-    exec_mock = MagicMock(return_value=True)
-    session_mock.configure_mock(**{"exec.return_value": exec_mock})
-
-    with (
-        patch("sqlmodel.Session", return_value=session_mock),
-        patch("logfire.info"),
-        patch("logfire.error"),
-        patch("logfire.warning"),
-    ):
+    with patch("app.backend_pre_start.logger"):
         try:
             init(engine_mock)
             connection_successful = True
@@ -28,6 +22,41 @@ def test_init_successful_connection() -> None:
             connection_successful
         ), "The database connection should be successful and not raise an exception."
 
-        assert session_mock.exec.called_once_with(
-            select(1)
-        ), "The session should execute a select statement once."
+        assert (
+            connection_mock.execute.call_count == 1
+        ), "The connection should execute a select statement once."
+
+
+def test_init_does_not_retry_non_connection_errors() -> None:
+    engine_mock = MagicMock()
+    engine_mock.connect.side_effect = ValueError
+
+    with patch("app.backend_pre_start.logger"):
+        with pytest.raises(ValueError):
+            init(engine_mock)
+
+        assert (
+            engine_mock.connect.call_count == 1
+        ), "Errors other than OperationalError should fail fast without retrying."
+
+
+def test_init_retries_connection_errors() -> None:
+    engine_mock = MagicMock()
+    engine_mock.connect.side_effect = [
+        OperationalError("SELECT 1", {}, Exception("connection refused")),
+        MagicMock(),
+    ]
+
+    with (
+        patch.object(init.retry, "wait", wait_none()),  # type: ignore[attr-defined]
+        patch("app.backend_pre_start.logger") as logger_mock,
+    ):
+        init(engine_mock)
+
+        assert (
+            logger_mock.error.call_count == 1
+        ), "The failed connection attempt should be logged as an error."
+
+        assert (
+            engine_mock.connect.call_count == 2
+        ), "An OperationalError should be retried until the connection succeeds."